@@ -1,29 +1,178 @@
 import os
+import time
+import traceback
+import uuid
 import asyncio
+import functools
+import httpx
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import AsyncGenerator
-from pydantic import BaseModel
 from langchain_openai import AzureChatOpenAI
 from langchain.agents import create_agent
 from langchain.tools import tool
 from langchain_core.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.tools import StructuredTool
 
 
 try:
-    from mcp import ClientSession
+    from mcp import ClientSession, StdioServerParameters
     from mcp.client.sse import sse_client
+    from mcp.client.stdio import stdio_client
     MCP_AVAILABLE = True
 except ImportError:
     MCP_AVAILABLE = False
     print("Warning: MCP not installed. Install with: pip install mcp")
 
-from agent_config import AgentConfig, MCPServerConfig, ToolConfig
+try:
+    import h2  # noqa: F401 - only needed by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    print("Warning: h2 not installed, using HTTP/1.1 for the LLM. Install with: pip install httpx[http2]")
+
+from agent_config import AgentConfig, MCPServerConfig, MCPStdioConfig, ToolConfig
+
+
+# Text chunks are coalesced until this much time has passed or this many characters are buffered
+TEXT_STREAM_FLUSH_SECONDS = 0.02
+TEXT_STREAM_FLUSH_CHARS = 256
+# Marks the end of the event stream in invoke_stream's queue, which holds at most this many events
+_STREAM_END = object()
+EVENT_QUEUE_SIZE = 64
+
+# Connection pools shared by all LLM clients, so streams to the endpoint reuse the same TLS connections.
+# Pooled connections are bound to the event loop that opened them, so there is one pool per loop.
+_HTTP_CLIENTS: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+# Warmup request per cached LLM client (keyed like _make_llm), so agents sharing a client warm it up only once
+_WARMUPS: dict[tuple, asyncio.Task] = {}
+
+# Unknown roles fall back to HumanMessage
+ROLE_MAP: dict[str, type[BaseMessage]] = {
+    "user": HumanMessage,
+    "assistant": AIMessage,
+    "agent": AIMessage,
+    "ai": AIMessage,
+}
+
+
+def _shared_http_client() -> httpx.AsyncClient:
+    """Get the connection pool shared by all LLM clients on the running event loop."""
+    loop = asyncio.get_running_loop()
+    for closed_loop in [other for other in _HTTP_CLIENTS if other.is_closed()]:
+        # Connections of a finished loop can neither be reused nor closed anymore
+        _drop_warmups(_HTTP_CLIENTS.pop(closed_loop))
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None:
+        client = _HTTP_CLIENTS[loop] = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+        )
+    return client
+
+
+async def close_shared_http_client() -> None:
+    """Close the running loop's LLM connection pool - call once at shutdown.
+
+    The cached LLM clients built on it are dropped, so agents created afterwards get a new pool.
+    """
+    client = _HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    _make_llm.cache_clear()
+    if client is not None:
+        # Let pending warmups unwind before their connection pool is closed
+        warmups = _drop_warmups(client)
+        for task in warmups:
+            task.cancel()
+        await asyncio.gather(*warmups, return_exceptions=True)
+        await client.aclose()
+
+
+def _drop_warmups(http_client: httpx.AsyncClient) -> list[asyncio.Task]:
+    """Forget the warmups of the LLM clients on the given connection pool and return them."""
+    keys = [key for key in _WARMUPS if key[-1] is http_client]
+    return [_WARMUPS.pop(key) for key in keys]
+
+
+@functools.lru_cache(maxsize=32)
+def _make_llm(
+    endpoint: str,
+    deployment: str,
+    api_version: str,
+    api_key_env: str,
+    http_client: httpx.AsyncClient
+) -> AzureChatOpenAI:
+    """Create the Azure OpenAI client, shared by all agents using the same deployment and connection pool."""
+    # Tokens already reach the caller via astream_events; echoing them to stdout is for debugging only
+    callbacks = [StreamingStdOutCallbackHandler()] if os.getenv("AGENT_DEBUG_STREAM") else None
+    return AzureChatOpenAI(
+        api_key=os.getenv(api_key_env),
+        azure_endpoint=endpoint,
+        azure_deployment=deployment,
+        api_version=api_version,
+        streaming=True,
+        callbacks=callbacks,
+        http_async_client=http_client
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _stdio_params(
+    command: str,
+    args: tuple[str, ...],
+    env_items: tuple[tuple[str, str], ...] | None
+) -> "StdioServerParameters":
+    """Create the server parameters for a stdio MCP server once per distinct config."""
+    return StdioServerParameters(
+        command=command,
+        args=list(args),
+        env=dict(env_items) if env_items is not None else None
+    )
+
+
+def _stdio_key(mcp_config: MCPStdioConfig) -> tuple:
+    """Hashable form of a stdio config, used for both the parameter and the session cache."""
+    env_items = tuple(sorted(mcp_config.env.items())) if mcp_config.env is not None else None
+    return (mcp_config.command, tuple(mcp_config.args), env_items)
+
 
+def _mcp_session_key(mcp_config: MCPServerConfig) -> tuple:
+    """Build a hashable key identifying the MCP server behind a config."""
+    if mcp_config.transport == "stdio":
+        return ("stdio", *_stdio_key(mcp_config))
+    return ("sse", mcp_config.url, frozenset((mcp_config.headers or {}).items()))
 
-class UnifiedUIMessage(BaseModel):
+
+def _mcp_client(mcp_config: MCPServerConfig):
+    """Create the transport client for the MCP server behind a config."""
+    if mcp_config.transport == "stdio":
+        return stdio_client(_stdio_params(*_stdio_key(mcp_config)))
+    return sse_client(mcp_config.url, headers=mcp_config.headers or {})
+
+
+def _with_id(message_class: type[BaseMessage], content: str) -> BaseMessage:
+    """Create a message with a fixed id, so LangGraph does not assign one to the (cached) object."""
+    return message_class(content=content, id=str(uuid.uuid4()))
+
+
+def _mcp_result_text(response) -> str:
+    """Extract the text of an MCP tool response - text (usually JSON) is passed through to the LLM as is."""
+    if not (hasattr(response, 'content') and response.content):
+        return str(response)
+
+    parts = []
+    for content in response.content:
+        if hasattr(content, 'text'):
+            parts.append(content.text)
+        elif isinstance(content, dict) and 'text' in content:
+            parts.append(content['text'])
+    return "".join(parts)
+
+
+@dataclass(slots=True, frozen=True)
+class UnifiedUIMessage:
     role: str
     content: str
 
@@ -43,17 +192,73 @@ class BaseUnifiedUIAgent(ABC):
 
 
 class ReACTAgent(BaseUnifiedUIAgent):
+    # Events forwarded by invoke_stream besides the coalesced TEXT_STREAM chunks
+    _EVENT_YIELDERS = {
+        "on_tool_start": lambda e: {"type": "TOOL_START", "content": e["name"]},
+        "on_tool_end": lambda e: {"type": "TOOL_END", "content": e["data"]["output"]},
+    }
+
     def __init__(self, config: AgentConfig):
         """Initialize the ReACT agent with the given configuration."""
         self._config = config
         self.llm = None
         self.agent = None
+        self._tools: list = []
+        self._http_client: httpx.AsyncClient | None = None
+        self._llm_key: tuple | None = None
+        self._ready_task: asyncio.Task | None = None
+        self._warmup_task: asyncio.Task | None = None
+        # Persistent MCP sessions, resolved once per server and reused for every tool call.
+        # Each session is owned by a task that holds it open until its closing event is set.
+        self._mcp_sessions: dict[tuple, asyncio.Future] = {}
+        self._mcp_tasks: list[tuple[asyncio.Task, asyncio.Event]] = []
+        # Instructions are fixed after config load, so the system message is built once.
+        # LangGraph assigns missing message ids in place, so the cached messages get their id up front:
+        # they are then never mutated, and a message keeps the same id on every turn it is sent.
+        self._system_message = _with_id(SystemMessage, config.settings.instructions) if config.settings.instructions else None
+        # Converted chat history, extended incrementally as new messages arrive
+        self._converted_cache: list[BaseMessage] = []
+        self._converted_last: UnifiedUIMessage | None = None
     
     async def initialize(self):
         """Async initialization of the agent."""
-        await self._setup_agent(self._config)
+        await self._ensure_ready()
         return self
 
+    def start_initialize(self) -> None:
+        """Start initialization in the background, so it overlaps with e.g. waiting for user input."""
+        if self._ready_task is None:
+            self._ready_task = asyncio.create_task(self._setup_agent(self._config))
+
+    async def _ensure_ready(self) -> None:
+        """Wait until the agent is initialized, starting initialization if necessary."""
+        self.start_initialize()
+        await self._ready_task
+        if self._http_client is not _shared_http_client():
+            # The LLM was built on the pool of another (or an already closed) loop - rebuild it for this one
+            self._bind_llm()
+            self.agent = create_agent(self.llm, tools=self._tools)
+
+    async def close(self) -> None:
+        """Close all persistent MCP sessions held by the agent."""
+        # Tasks of an earlier (already finished) event loop were torn down together with that loop
+        loop = asyncio.get_running_loop()
+        if self._ready_task is not None and self._ready_task.get_loop() is loop and not self._ready_task.done():
+            self._ready_task.cancel()
+            await asyncio.gather(self._ready_task, return_exceptions=True)
+        self._ready_task = None
+        if self._warmup_task is not None and self._warmup_task.get_loop() is loop and not self._warmup_task.done():
+            # Let the request unwind before the caller closes the connection pool it runs on
+            self._warmup_task.cancel()
+            await asyncio.gather(self._warmup_task, return_exceptions=True)
+        self._warmup_task = None
+        owned = [(task, closing) for task, closing in self._mcp_tasks if task.get_loop() is loop]
+        for _, closing in owned:
+            closing.set()
+        await asyncio.gather(*(task for task, _ in owned), return_exceptions=True)
+        self._mcp_tasks.clear()
+        self._mcp_sessions.clear()
+
     def invoke(self, messages: list[UnifiedUIMessage]) -> dict:
         """Invoke the agent with the given messages."""
         langchain_messages = self._convert_to_langchain_messages(messages)
@@ -64,168 +269,291 @@ class ReACTAgent(BaseUnifiedUIAgent):
 
     async def invoke_stream(self, messages: list[UnifiedUIMessage]) -> AsyncGenerator[dict, None]:
         """Invoke the agent in streaming mode with the given messages."""
+        await self._ensure_ready()
         langchain_messages = self._convert_to_langchain_messages(messages)
-        async for event in self.agent.astream_events(
-            {"messages": langchain_messages},
-            version="v1"
-        ):
-            kind = event["event"]
-            if kind == "on_chain_start":
-                # print(f"on_chain_start: {event}")
-                pass
-            elif kind == "on_chain_end":
-                # print(f"on_chain_end: {event}")
-                pass
-            elif kind == "on_chat_model_stream":
-                content = event["data"]["chunk"].content
-                # print(content, end="", flush=True)
-                yield {"type": "TEXT_STREAM", "content": content}
-            elif kind == "on_tool_start":
-                # print(f"\nUsing tool: {event}")
-                yield {"type": "TOOL_START", "content": event["name"]}
-            elif kind == "on_tool_end":
-                # print(f"Tool result: {event}")
-                yield {"type": "TOOL_END", "content": event["data"]["output"]}
-            
+        buffer: list[str] = []
+        buffered_chars = 0
+        last_flush = time.monotonic()
+        # Events are read from a bounded queue, so buffered text can be flushed on a timer between slow
+        # tokens without cancelling the event generator itself
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        pump = asyncio.create_task(self._pump_events(langchain_messages, queue))
+        pending_get: asyncio.Task | None = None
+        try:
+            while True:
+                if pending_get is None and not queue.empty():
+                    # Events that are already there are taken without a task or timer per token
+                    event = queue.get_nowait()
+                elif not buffered_chars:
+                    # Nothing to flush, so just wait for the next event
+                    event = await (pending_get or queue.get())
+                    pending_get = None
+                else:
+                    # Wait for the next event at most until the buffered text is due, without cancelling the get
+                    pending_get = pending_get or asyncio.ensure_future(queue.get())
+                    timeout = max(0.0, last_flush + TEXT_STREAM_FLUSH_SECONDS - time.monotonic())
+                    done, _ = await asyncio.wait({pending_get}, timeout=timeout)
+                    if not done:
+                        # No new token within the window - don't hold back what is already buffered
+                        yield {"type": "TEXT_STREAM", "content": "".join(buffer)}
+                        buffer, buffered_chars, last_flush = [], 0, time.monotonic()
+                        continue
+                    event = pending_get.result()
+                    pending_get = None
+                if event is _STREAM_END:
+                    break
+                if isinstance(event, Exception):
+                    raise event
+                
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    buffer.append(content)
+                    buffered_chars += len(content)
+                    if buffered_chars >= TEXT_STREAM_FLUSH_CHARS or time.monotonic() - last_flush >= TEXT_STREAM_FLUSH_SECONDS:
+                        if buffered_chars:
+                            yield {"type": "TEXT_STREAM", "content": "".join(buffer)}
+                        buffer, buffered_chars, last_flush = [], 0, time.monotonic()
+                    continue
+                
+                # Remaining events we don't forward (e.g. on_chat_model_start) are dropped here
+                handler = self._EVENT_YIELDERS.get(kind)
+                if handler is None:
+                    continue
+                if buffered_chars:
+                    yield {"type": "TEXT_STREAM", "content": "".join(buffer)}
+                buffer, buffered_chars, last_flush = [], 0, time.monotonic()
+                yield handler(event)
+        finally:
+            # Stops the agent run if the consumer stops iterating early
+            if pending_get is not None:
+                pending_get.cancel()
+            pump.cancel()
+            await asyncio.gather(pump, return_exceptions=True)
+        
+        # Flush whatever text is left once the stream ends
+        if buffered_chars:
+            yield {"type": "TEXT_STREAM", "content": "".join(buffer)}
+
+    async def _pump_events(self, langchain_messages: list, queue: asyncio.Queue) -> None:
+        """Put the agent's stream events into the queue, followed by the end marker or the raised error."""
+        try:
+            # Only chat model and tool events are consumed, so LangChain does not emit the chain events at all
+            async for event in self.agent.astream_events(
+                {"messages": langchain_messages},
+                version="v1",
+                include_types=["chat_model", "tool"]
+            ):
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_STREAM_END)
 
     async def _setup_agent(self, config: AgentConfig) -> None:
         """Setup the LangChain agent based on the configuration."""
-        api_key = os.getenv(config.settings.llm_credentials.api_key)
-        self.llm = AzureChatOpenAI(
-            api_key=api_key,
-            azure_endpoint=config.settings.llm_credentials.endpoint,
-            azure_deployment=config.settings.llm_credentials.deployment_name,
-            api_version=config.settings.llm_credentials.api_version,
-            streaming=True,
-            callbacks=[StreamingStdOutCallbackHandler()]
-        )
+        self._bind_llm()
+        # Open the LLM connection while the MCP servers are being discovered and the user types -
+        # only once per shared LLM client, agents reusing a warm client skip it
+        if self._llm_key not in _WARMUPS:
+            self._warmup_task = _WARMUPS[self._llm_key] = asyncio.create_task(self._warmup())
         
         # Load tools from config
-        tools = await self._load_tools(config)
-        self.agent = create_agent(self.llm, tools=tools)
+        self._tools = await self._load_tools(config)
+        self.agent = create_agent(self.llm, tools=self._tools)
+
+    def _bind_llm(self) -> None:
+        """Get the shared LLM client for the configured deployment on the running loop's connection pool."""
+        credentials = self._config.settings.llm_credentials
+        self._http_client = _shared_http_client()
+        self._llm_key = (
+            credentials.endpoint,
+            credentials.deployment_name,
+            credentials.api_version,
+            credentials.api_key,
+            self._http_client
+        )
+        self.llm = _make_llm(*self._llm_key)
+
+    async def _warmup(self) -> None:
+        """Send a minimal request to the LLM so the first user turn does not pay for the connection setup."""
+        try:
+            await self.llm.ainvoke([SystemMessage(content="ping")], max_tokens=1)
+        except Exception as e:
+            print(f"LLM warmup failed: {e}")
 
     async def _load_tools(self, config: AgentConfig) -> list:
         """Load tools from configuration."""
         tools = []
+        mcp_tool_configs = []
         
         for tool_config in config.settings.tools:
             if tool_config.type == "mcp_server":
-                if MCP_AVAILABLE:
-                    mcp_tools = await self._load_mcp_tools(tool_config)
-                    tools.extend(mcp_tools)
+                if tool_config.mcp_config is None:
+                    print(f"Skipping MCP tool {tool_config.name} - no mcp_config given")
+                elif MCP_AVAILABLE:
+                    mcp_tool_configs.append(tool_config)
                 else:
                     print(f"Skipping MCP tool {tool_config.name} - MCP not installed")
             # Add more tool types here as needed
         
+        # Discover tools of all MCP servers concurrently
+        results = await asyncio.gather(
+            *(self._load_mcp_tools(tc) for tc in mcp_tool_configs),
+            return_exceptions=True
+        )
+        for tool_config, result in zip(mcp_tool_configs, results):
+            if isinstance(result, Exception):
+                print(f"Error loading MCP tools from {tool_config.name}: {result}")
+                traceback.print_exception(result)
+            elif isinstance(result, BaseException):
+                # Cancellation of the setup is not a load error
+                raise result
+            else:
+                tools.extend(result)
+        
         return tools
 
     async def _load_mcp_tools(self, tool_config: ToolConfig) -> list[StructuredTool]:
-        """Load tools from an MCP server."""
+        """Load tools from an MCP server - errors are reported by _load_tools."""
         mcp_config = tool_config.mcp_config
-        if isinstance(mcp_config, dict):
-            mcp_config = MCPServerConfig(**mcp_config)
         
         tools = []
         allowed_tools = tool_config.allowed_tools  # Optional filter list
         
-        try:
-            # Start MCP server and get available tools
-            mcp_tools_info = await self._get_mcp_tools_async(mcp_config, tool_config.name)
-            
-            # Filter tools if allowed_tools is specified
-            if allowed_tools:
-                mcp_tools_info = [t for t in mcp_tools_info if t['name'] in allowed_tools]
-                print(f"Filtered to {len(mcp_tools_info)} allowed tools: {allowed_tools}")
-            
-            # Create LangChain tools from MCP tool definitions
-            for tool_info in mcp_tools_info:
-                # Create a closure to capture the current tool info
-                def make_tool_func(ti, mc, tn):
-                    async def tool_func(**kwargs) -> str:
-                        """Execute MCP tool with given parameters."""
-                        return await self._call_mcp_tool_async(mc, tn, ti['name'], kwargs)
-                    
-                    # Make it synchronous for LangChain
-                    def sync_tool_func(**kwargs) -> str:
-                        return asyncio.run(tool_func(**kwargs))
-                    
-                    return sync_tool_func
+        # Start MCP server and get available tools
+        mcp_tools_info = await self._get_mcp_tools_async(mcp_config, tool_config.name)
+        
+        # Filter tools if allowed_tools is specified
+        if allowed_tools:
+            mcp_tools_info = [t for t in mcp_tools_info if t['name'] in allowed_tools]
+            print(f"Filtered to {len(mcp_tools_info)} allowed tools: {allowed_tools}")
+        
+        # Create LangChain tools from MCP tool definitions
+        for tool_info in mcp_tools_info:
+            # Create a closure to capture the current tool info
+            def make_tool_funcs(ti, mc, tn):
+                async def tool_func(**kwargs) -> str:
+                    """Execute MCP tool with given parameters."""
+                    return await self._call_mcp_tool_async(mc, tn, ti['name'], kwargs)
                 
-                # Create the structured tool
-                lc_tool = StructuredTool.from_function(
-                    func=make_tool_func(tool_info, mcp_config, tool_config.name),
-                    name=tool_info['name'],
-                    description=tool_info['description'],
-                    args_schema=tool_info.get('input_schema')
-                )
-                tools.append(lc_tool)
-            
-            print(f"Loaded {len(tools)} MCP tools from {tool_config.name}")
+                # Fallback for sync callers only - async callers await tool_func on their own loop.
+                # The persistent sessions belong to the agent's loop, so this opens a one-off session.
+                def sync_tool_func(**kwargs) -> str:
+                    if asyncio._get_running_loop() is not None:
+                        raise RuntimeError(
+                            f"MCP tool {ti['name']} must be awaited when an event loop is running"
+                        )
+                    return asyncio.run(self._call_mcp_tool_once(mc, ti['name'], kwargs))
+                
+                return tool_func, sync_tool_func
             
-        except Exception as e:
-            print(f"Error loading MCP tools from {tool_config.name}: {e}")
-            import traceback
-            traceback.print_exc()
+            # Create the structured tool
+            coroutine, func = make_tool_funcs(tool_info, mcp_config, tool_config.name)
+            lc_tool = StructuredTool.from_function(
+                func=func,
+                coroutine=coroutine,
+                name=tool_info['name'],
+                description=tool_info['description'],
+                args_schema=tool_info.get('input_schema')
+            )
+            tools.append(lc_tool)
+        
+        print(f"Loaded {len(tools)} MCP tools from {tool_config.name}")
         
         return tools
     
     async def _get_mcp_tools_async(self, mcp_config: MCPServerConfig, server_name: str) -> list:
-        """Get available tools from remote MCP server via SSE."""
+        """Get available tools from an MCP server via the persistent session."""
         tools_info = []
+        # Opens the session that all later tool calls to this server reuse
+        session = await self._get_session(mcp_config)
         
-        async with sse_client(mcp_config.url, headers=mcp_config.headers or {}) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # List available tools
-                tools_response = await session.list_tools()
-                
-                for tool in tools_response.tools:
-                    tools_info.append({
-                        'name': tool.name,
-                        'description': tool.description or f"MCP tool: {tool.name}",
-                        'input_schema': tool.inputSchema if hasattr(tool, 'inputSchema') else None
-                    })
+        # List available tools
+        tools_response = await session.list_tools()
+        
+        for tool in tools_response.tools:
+            tools_info.append({
+                'name': tool.name,
+                'description': tool.description or f"MCP tool: {tool.name}",
+                'input_schema': tool.inputSchema if hasattr(tool, 'inputSchema') else None
+            })
         
         return tools_info
     
+    async def _get_session(self, mcp_config: MCPServerConfig) -> "ClientSession":
+        """Get the persistent MCP session for the given server, opening it on first use."""
+        loop = asyncio.get_running_loop()
+        key = _mcp_session_key(mcp_config)
+        ready = self._mcp_sessions.get(key)
+        # A session opened on another event loop (e.g. a previous asyncio.run) can't be used on this one
+        if ready is None or ready.get_loop() is not loop:
+            ready = loop.create_future()
+            closing = asyncio.Event()
+            self._mcp_sessions[key] = ready
+            self._mcp_tasks = [(task, event) for task, event in self._mcp_tasks if not task.done()]
+            self._mcp_tasks.append((asyncio.create_task(self._hold_session(key, mcp_config, ready, closing)), closing))
+        # Shield the shared future so a cancelled caller does not tear it down for everyone else
+        return await asyncio.shield(ready)
+
+    async def _hold_session(self, key: tuple, mcp_config: MCPServerConfig, ready: asyncio.Future, closing: asyncio.Event) -> None:
+        """Keep an MCP session open until its closing event is set by close().
+
+        The transport clients run inside an anyio task group, which has to be exited
+        by the same task that entered it, so every session is owned by its own task.
+        """
+        try:
+            async with _mcp_client(mcp_config) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"MCP session to {key[1]} closed unexpectedly: {e}")
+        finally:
+            if not ready.done():
+                # Waiters get an error instead of a cancellation they would mistake for their own
+                ready.set_exception(ConnectionError(f"MCP session to {key[1]} closed before it was initialized"))
+            # Drop the dead session so the next call reconnects
+            if self._mcp_sessions.get(key) is ready:
+                del self._mcp_sessions[key]
+
     async def _call_mcp_tool_async(self, mcp_config: MCPServerConfig, server_name: str, tool_name: str, arguments: dict) -> str:
-        """Call a remote MCP tool via SSE with the given arguments."""
-        result = ""
-        
-        async with sse_client(mcp_config.url, headers=mcp_config.headers or {}) as (read, write):
+        """Call an MCP tool via the persistent session with the given arguments."""
+        session = await self._get_session(mcp_config)
+
+        # Call the tool
+        response = await session.call_tool(tool_name, arguments=arguments)
+        return _mcp_result_text(response)
+
+    async def _call_mcp_tool_once(self, mcp_config: MCPServerConfig, tool_name: str, arguments: dict) -> str:
+        """Call an MCP tool via a short-lived session, bypassing the persistent session cache."""
+        async with _mcp_client(mcp_config) as (read, write):
             async with ClientSession(read, write) as session:
                 await session.initialize()
-                
-                # Call the tool
                 response = await session.call_tool(tool_name, arguments=arguments)
-                
-                # Extract content from response
-                if hasattr(response, 'content') and response.content:
-                    for content in response.content:
-                        if hasattr(content, 'text'):
-                            result += content.text
-                        elif isinstance(content, dict) and 'text' in content:
-                            result += content['text']
-                else:
-                    result = str(response)
-        
-        return result
+        return _mcp_result_text(response)
 
     def _convert_to_langchain_messages(self, messages: list[UnifiedUIMessage]) -> list:
         """Convert UnifiedUIMessage to LangChain message objects."""
         langchain_messages = []
         
         # Add system instructions as first message
-        if self._config.settings.instructions:
-            langchain_messages.append(SystemMessage(content=self._config.settings.instructions))
-        
-        for msg in messages:
-            if msg.role == "user":
-                langchain_messages.append(HumanMessage(content=msg.content))
-            elif msg.role in ["assistant", "agent", "ai"]:
-                langchain_messages.append(AIMessage(content=msg.content))
-            else:
-                # Fallback to HumanMessage for unknown roles
-                langchain_messages.append(HumanMessage(content=msg.content))
+        if self._system_message is not None:
+            langchain_messages.append(self._system_message)
+        
+        # Only convert the new suffix if the history still starts with the cached prefix
+        cached = len(self._converted_cache)
+        if not (cached and len(messages) >= cached and messages[cached - 1] is self._converted_last):
+            self._converted_cache = []
+            cached = 0
+        
+        for msg in messages[cached:]:
+            self._converted_cache.append(_with_id(ROLE_MAP.get(msg.role, HumanMessage), msg.content))
+        self._converted_last = messages[-1] if messages else None
+        
+        langchain_messages.extend(self._converted_cache)
         return langchain_messages
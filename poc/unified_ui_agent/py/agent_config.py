@@ -1,6 +1,8 @@
-import json
+import asyncio
+import orjson
 
-from pydantic import BaseModel
+from typing import Annotated, Literal, Union
+from pydantic import BaseModel, Field
 
 
 class LLMCredentials(BaseModel):
@@ -11,16 +13,27 @@ class LLMCredentials(BaseModel):
     api_key: str
 
 
-class MCPServerConfig(BaseModel):
+class MCPStdioConfig(BaseModel):
+    transport: Literal["stdio"]
+    command: str  # e.g., "npx"
+    args: list[str] = []
+    env: dict[str, str] | None = None  # Optional environment for the server process
+
+
+class MCPSseConfig(BaseModel):
+    transport: Literal["sse"]
     url: str  # e.g., "http://localhost:8000/sse"
     headers: dict[str, str] | None = None  # Optional headers (e.g., API keys)
 
 
+MCPServerConfig = Annotated[Union[MCPStdioConfig, MCPSseConfig], Field(discriminator="transport")]
+
+
 class ToolConfig(BaseModel):
     type: str  # "mcp_server" | "web_search" | "custom"
     name: str
     description: str
-    mcp_config: MCPServerConfig | dict
+    mcp_config: MCPServerConfig | None = None  # Only required for type "mcp_server"
     allowed_tools: list[str] | None = None  # Optional: Filter to only use specific tools from MCP server
 
 
@@ -50,6 +63,11 @@ class AgentConfig(BaseModel):
 
 def load_config(path: str) -> AgentConfig:
     """Load configuration from a JSON file and parse into Pydantic model."""
-    with open(path, "r") as file:
-        data = json.load(file)
-    return AgentConfig(**data)
+    with open(path, "rb") as file:
+        data = orjson.loads(file.read())
+    return AgentConfig.model_validate(data)
+
+
+async def load_config_async(path: str) -> AgentConfig:
+    """Load configuration from a JSON file without blocking the event loop."""
+    return await asyncio.to_thread(load_config, path)
@@ -1,8 +1,15 @@
 import asyncio
 
 from dotenv import load_dotenv
-from agent_config import load_config
-from agent import ReACTAgent, UnifiedUIMessage
+from agent_config import load_config_async
+from agent import ReACTAgent, UnifiedUIMessage, close_shared_http_client
+
+try:
+    from aioconsole import ainput
+except ImportError:
+    async def ainput(prompt: str = "") -> str:
+        """Fallback prompt that reads input in a worker thread."""
+        return await asyncio.to_thread(input, prompt)
 
 
 load_dotenv()
@@ -15,23 +22,35 @@ async def main():
     """Main function to create and run the agent based on config."""
     # Setup
     messages = []
-    config = load_config(CONFIG_PATH)
+    config = await load_config_async(CONFIG_PATH)
     
     agent = ReACTAgent(config)
-    await agent.initialize()
+    # Tool discovery and LLM setup run in the background and are awaited by the first invoke_stream
+    agent.start_initialize()
+
+    try:
+        await chat_loop(agent, messages)
+    finally:
+        await agent.close()
+        await close_shared_http_client()
+
 
+async def chat_loop(agent: ReACTAgent, messages: list[UnifiedUIMessage]):
+    """Read user input and stream the agent's responses until the user exits."""
     while True:
-        user_input = input("\nUser: ")
+        user_input = await ainput("\nUser: ")
         if user_input.lower() in {"exit", "quit"}:
             break
 
         messages.append(UnifiedUIMessage(role="user", content=user_input))
 
         print("Agent:", end=" ", flush=True)
-        agent_response_content = ""
+        chunks: list[str] = []
         async for response in agent.invoke_stream(messages):
             if response.get("type") == "TEXT_STREAM":
-                agent_response_content += response.get("content", "")
+                content = response.get("content", "")
+                print(content, end="", flush=True)
+                chunks.append(content)
             if response.get("type") == "TOOL_START":
                 tool_name = response.get("content", "")
                 print(f"\n[Tool Started: {tool_name}]", end=" ", flush=True)
@@ -40,6 +59,7 @@ async def main():
                 print(f"\n[Tool Output: {tool_output}]", end=" ", flush=True)
 
         print()  # Newline after streaming
+        agent_response_content = "".join(chunks)
         # Append agent's response to messages
         if agent_response_content:
             messages.append(UnifiedUIMessage(role="assistant", content=agent_response_content))
@@ -0,0 +1,234 @@
+import sys
+import time
+import asyncio
+import functools
+
+from types import SimpleNamespace
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+
+import agent as agent_module
+from agent import ReACTAgent, UnifiedUIMessage, TEXT_STREAM_FLUSH_SECONDS
+from agent_config import AgentConfig
+
+
+MCP_SERVER = '''
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("Test Calculator")
+
+
+@mcp.tool()
+def add(a: float, b: float) -> float:
+    """Add two numbers together."""
+    return a + b
+
+
+if __name__ == "__main__":
+    mcp.run()
+'''
+
+
+class StubChatModel(GenericFakeChatModel):
+    """Fake chat model that replays scripted messages and ignores bound tools."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _make_config(server_path: str | None = None) -> AgentConfig:
+    tools = []
+    if server_path is not None:
+        tools.append({
+            "type": "mcp_server",
+            "name": "calculator",
+            "description": "Adds numbers.",
+            "mcp_config": {
+                "transport": "stdio",
+                "command": sys.executable,
+                "args": [server_path]
+            }
+        })
+    return AgentConfig.model_validate({
+        "docversion": "v1",
+        "type": "UNIFIED_UI_AGENT",
+        "tenant_id": "tenant",
+        "application_id": "application",
+        "settings": {
+            "agent_version": "v1",
+            "agent_type": "ReACT_AGENT",
+            "instructions": "You are a test agent.",
+            "llm_credentials": {
+                "type": "AZURE_OPENAI",
+                "deployment_name": "deployment",
+                "api_version": "2025-01-01-preview",
+                "endpoint": "https://example.openai.azure.com/",
+                "api_key": "AZURE_OPENAI_API_KEY"
+            },
+            "tools": tools
+        },
+        "user": {
+            "id": "user",
+            "display_name": "User",
+            "principal_name": "user@example.com",
+            "mail": "user@example.com"
+        }
+    })
+
+
+def _use_stub_llm(monkeypatch, *messages: AIMessage) -> None:
+    """Replace the Azure LLM with a stub replaying the given messages and skip the warmup request."""
+    llm = StubChatModel(messages=iter(messages))
+    monkeypatch.setattr(agent_module, "_make_llm", lambda *args: llm)
+    _skip_warmup(monkeypatch)
+
+
+def _skip_warmup(monkeypatch) -> None:
+    async def no_warmup(self):
+        pass
+    monkeypatch.setattr(ReACTAgent, "_warmup", no_warmup)
+
+
+def test_sync_invoke_calls_mcp_tool(tmp_path, monkeypatch):
+    """Sync invoke() after an async initialize() runs MCP tools on its own loop."""
+    server_path = tmp_path / "server.py"
+    server_path.write_text(MCP_SERVER)
+
+    _use_stub_llm(
+        monkeypatch,
+        AIMessage(content="", tool_calls=[{"name": "add", "args": {"a": 1, "b": 2}, "id": "call_1"}]),
+        AIMessage(content="The result is 3."),
+    )
+
+    agent = ReACTAgent(_make_config(str(server_path)))
+    asyncio.run(agent.initialize())
+
+    result = agent.invoke([UnifiedUIMessage(role="user", content="What is 1 + 2?")])
+
+    tool_messages = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+    assert len(tool_messages) == 1
+    assert tool_messages[0].status == "success"
+    assert float(tool_messages[0].content) == 3.0
+    assert result["messages"][-1].content == "The result is 3."
+
+
+def test_invoke_does_not_mutate_cached_messages(monkeypatch):
+    """The cached system message and converted history are sent as is and not changed by a run."""
+    _use_stub_llm(monkeypatch, AIMessage(content="Hello!"))
+
+    agent = ReACTAgent(_make_config())
+    asyncio.run(agent.initialize())
+    history = [UnifiedUIMessage(role="user", content="Hi")]
+    expected = [m.model_dump() for m in agent._convert_to_langchain_messages(history)]
+
+    result = agent.invoke(history)
+
+    assert result["messages"][-1].content == "Hello!"
+    assert [m.model_dump() for m in agent._convert_to_langchain_messages(history)] == expected
+
+
+class ScriptedGraph:
+    """Stands in for the compiled agent graph and emits scripted stream events, optionally after a pause."""
+
+    def __init__(self, script: list[tuple[float, dict]]):
+        self.script = script
+        self.emitted_at: list[float] = []
+
+    async def astream_events(self, *args, **kwargs):
+        for pause, event in self.script:
+            await asyncio.sleep(pause)
+            self.emitted_at.append(time.monotonic())
+            yield event
+
+
+def _token(text: str) -> dict:
+    return {"event": "on_chat_model_stream", "data": {"chunk": SimpleNamespace(content=text)}}
+
+
+def test_invoke_stream_flushes_buffered_text_during_pause(monkeypatch):
+    """Text buffered before a slow token is yielded within the flush window, and before following tool events."""
+    pause = 0.5
+    graph = ScriptedGraph([
+        (0, _token("Hel")),
+        (0, _token("lo")),
+        (pause, _token(" world")),
+        (0, {"event": "on_tool_start", "name": "add"}),
+        (0, {"event": "on_tool_end", "data": {"output": "3"}}),
+        (0, _token("Done")),
+    ])
+
+    _use_stub_llm(monkeypatch)
+
+    async def setup_agent(self, config):
+        self._bind_llm()
+        self.agent = graph
+    monkeypatch.setattr(ReACTAgent, "_setup_agent", setup_agent)
+
+    async def collect():
+        agent = ReACTAgent(_make_config())
+        return [(time.monotonic(), item) async for item in agent.invoke_stream([])]
+
+    received = asyncio.run(collect())
+
+    assert [item for _, item in received] == [
+        {"type": "TEXT_STREAM", "content": "Hello"},
+        {"type": "TEXT_STREAM", "content": " world"},
+        {"type": "TOOL_START", "content": "add"},
+        {"type": "TOOL_END", "content": "3"},
+        {"type": "TEXT_STREAM", "content": "Done"},
+    ]
+    # "Hello" must not wait for the pause to end
+    assert received[0][0] - graph.emitted_at[1] < TEXT_STREAM_FLUSH_SECONDS + 0.1
+    assert received[0][0] < graph.emitted_at[2]
+
+
+def test_llm_is_rebuilt_for_the_http_pool_of_each_loop(monkeypatch):
+    """An agent initialized under one asyncio.run streams on another loop's connection pool, not the closed one."""
+    http_clients = []
+    llm = StubChatModel(messages=iter([AIMessage(content="Hello!")]))
+
+    @functools.lru_cache()
+    def make_llm(*args):
+        http_clients.append(args[-1])
+        return llm
+    monkeypatch.setattr(agent_module, "_make_llm", make_llm)
+    _skip_warmup(monkeypatch)
+
+    agent = ReACTAgent(_make_config())
+    asyncio.run(agent.initialize())
+
+    async def stream():
+        items = [item async for item in agent.invoke_stream([UnifiedUIMessage(role="user", content="Hi")])]
+        pool_open = not http_clients[-1].is_closed
+        await agent_module.close_shared_http_client()
+        return items, pool_open
+
+    items, pool_open = asyncio.run(stream())
+    assert items == [{"type": "TEXT_STREAM", "content": "Hello!"}]
+    assert len(http_clients) == 2
+    assert http_clients[0] is not http_clients[1]
+    assert pool_open
+
+
+def test_agents_sharing_an_llm_client_warm_it_up_once(monkeypatch):
+    """Only the first agent on a cached LLM client sends the warmup request."""
+    monkeypatch.setattr(agent_module, "_make_llm", functools.lru_cache()(lambda *args: StubChatModel(messages=iter([]))))
+    warmups = []
+
+    async def count_warmup(self):
+        warmups.append(self)
+    monkeypatch.setattr(ReACTAgent, "_warmup", count_warmup)
+
+    async def start_agents():
+        agents = [ReACTAgent(_make_config()), ReACTAgent(_make_config())]
+        for agent in agents:
+            await agent.initialize()
+        await asyncio.sleep(0)
+        for agent in agents:
+            await agent.close()
+        await agent_module.close_shared_http_client()
+
+    asyncio.run(start_agents())
+
+    assert len(warmups) == 1